@@ -3,12 +3,13 @@
 Launch the Weather Platform web dashboard.
 
 Usage:
-    python run_dashboard.py [--port PORT] [--host HOST] [--interval MINUTES] [--no-scheduler]
+    python run_dashboard.py [--port PORT] [--host HOST] [--threads N] [--interval MINUTES] [--no-scheduler]
 """
 import argparse
 import sys
 import logging
 from pathlib import Path
+from waitress import serve
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
@@ -24,6 +25,8 @@ def main():
     parser = argparse.ArgumentParser(description='Run Weather Platform Dashboard')
     parser.add_argument('--host', default='127.0.0.1', help='Host to bind to (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=5000, help='Port to bind to (default: 5000)')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='Number of request-handling threads (default: 8)')
     parser.add_argument('--interval', type=int, default=60,
                         help='Pipeline run interval in minutes (default: 60)')
     parser.add_argument('--no-scheduler', action='store_true',
@@ -36,7 +39,8 @@ def main():
     app = create_app(
         project_path=str(project_path),
         scheduler_interval=args.interval,
-        enable_scheduler=not args.no_scheduler
+        enable_scheduler=not args.no_scheduler,
+        preload_model=True
     )
 
     print("=" * 80)
@@ -50,7 +54,7 @@ def main():
     print("Press Ctrl+C to stop")
     print("=" * 80)
 
-    app.run(host=args.host, port=args.port, debug=True, use_reloader=False)
+    serve(app, host=args.host, port=args.port, threads=args.threads)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,15 @@
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
 
 
 def create_features(raw_data: pd.DataFrame, params: dict) -> pd.DataFrame:
     df = raw_data.copy()
-    df['valid'] = pd.to_datetime(df['valid'], errors='coerce')
-    df['tmpf'] = pd.to_numeric(df['tmpf'], errors='coerce')
+    # the pyarrow reader already types these; only coerce if a column came through as strings
+    if not is_datetime64_any_dtype(df['valid']):
+        df['valid'] = pd.to_datetime(df['valid'], errors='coerce')
+    if not is_numeric_dtype(df['tmpf']):
+        df['tmpf'] = pd.to_numeric(df['tmpf'], errors='coerce').astype('float64')
     df = df.dropna(subset=['valid', 'tmpf']).sort_values('valid')
 
     reference_date = pd.Timestamp(params['reference_date'])
@@ -16,8 +21,13 @@ def create_features(raw_data: pd.DataFrame, params: dict) -> pd.DataFrame:
     df['ft_days_since_2000'] = (df['valid'] - reference_date).dt.total_seconds() / (24 * 3600)
     df['ft_temp'] = df['tmpf']
 
+    lag_cols = [f'ft_temp_lag_{i}h' for i in range(1, num_lags + 1)]
+    # fill one (N, num_lags) float32 block from the sorted temps and attach it in a single assignment
+    temps = df['tmpf'].to_numpy(dtype=np.float32)
+    lags = np.full((len(temps), num_lags), np.nan, dtype=np.float32)
     for i in range(1, num_lags + 1):
-        df[f'ft_temp_lag_{i}h'] = df['tmpf'].shift(i)
+        lags[i:, i - 1] = temps[:-i]
+    df[lag_cols] = lags
 
     df['tgt_tmpf'] = df['tmpf'].shift(-1) # predict the next hour
 
@@ -27,10 +37,14 @@ def create_features(raw_data: pd.DataFrame, params: dict) -> pd.DataFrame:
                     'ft_days_since_2000', 
                     'ft_temp']
     
-    feature_cols_no_NAN = [f'ft_temp_lag_{i}h' for i in range(1, num_lags + 1)]
+    feature_cols_no_NAN = lag_cols
     feature_cols.append('tgt_tmpf')
 
     df = df[feature_cols + feature_cols_no_NAN]
     df = df.dropna(subset = feature_cols) # need to allow for NULL temps
 
+    # calendar features fit in int8, temperatures and day offsets in float32 (XGBoost bins in float32 anyway)
+    calendar_cols = ['ft_month', 'ft_day', 'ft_hour']
+    df = df.astype({col: 'int8' if col in calendar_cols else 'float32' for col in df.columns})
+
     return df
\ No newline at end of file
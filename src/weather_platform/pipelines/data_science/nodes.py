@@ -1,47 +1,119 @@
+import os
+from pathlib import Path
+from datetime import datetime
 import pandas as pd
 import numpy as np
 import optuna
 import shap
 import matplotlib.pyplot as plt
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
+import xgboost as xgb
+from joblib import Parallel, delayed
 from xgboost import XGBRegressor
+from optuna_integration.xgboost import XGBoostPruningCallback
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
+from sqlalchemy.engine import make_url
+
+
+def _cuda_available() -> bool:
+    try:
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+_XGB_DEVICE = "cuda" if _cuda_available() else "cpu"
+# SQLite serialises writers: cap the default worker count and let a locked write wait
+# rather than fail; larger parallel runs should point storage at a database server
+_MAX_DEFAULT_OPTUNA_JOBS = 4
+_SQLITE_BUSY_TIMEOUT_S = 60
+_PROJECT_ROOT = Path(__file__).parents[4]
+
+
+def _resolve_device(params: Dict[str, Any]) -> str:
+    device = params.get('device', 'auto')
+    return _XGB_DEVICE if device == 'auto' else device
 
 
 def prepare_model_data(
     primary_data: pd.DataFrame,
     params: Dict[str, Any]
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    feature_columns = params['feature_columns']
-    target_column = params['target_column']
-
-    X = primary_data[feature_columns]
-    y = primary_data[target_column]
+    # split one float32 frame of features + target; no per-split copies to re-attach the target
+    model_columns = params['feature_columns'] + [params['target_column']]
+    model_data = primary_data[model_columns].astype(np.float32)
 
-    X_temp, X_test, y_temp, y_test = train_test_split(
-        X, y,
+    temp_data, test_data = train_test_split(
+        model_data,
         test_size=params['test_size'],
         random_state=params['random_state']
     )
 
     val_size_adjusted = params['val_size'] / (1 - params['test_size'])
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_temp, y_temp,
+    train_data, val_data = train_test_split(
+        temp_data,
         test_size=val_size_adjusted,
         random_state=params['random_state']
     )
 
-    train_data = X_train.copy()
-    train_data[target_column] = y_train
-
-    val_data = X_val.copy()
-    val_data[target_column] = y_val
+    return train_data, val_data, test_data
 
-    test_data = X_test.copy()
-    test_data[target_column] = y_test
 
-    return train_data, val_data, test_data
+def _objective(trial, dtrain, dval, y_val, params: Dict[str, Any], device: str,
+               nthread: Optional[int] = None) -> float:
+    search_space = params['optuna']['search_space']
+    num_boost_round = trial.suggest_int('n_estimators', search_space['n_estimators']['low'], search_space['n_estimators']['high'])
+    param = {
+        'max_depth': trial.suggest_int('max_depth', search_space['max_depth']['low'], search_space['max_depth']['high']),
+        'learning_rate': trial.suggest_float('learning_rate', search_space['learning_rate']['low'], search_space['learning_rate']['high'], log=True),
+        'subsample': trial.suggest_float('subsample', search_space['subsample']['low'], search_space['subsample']['high']),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', search_space['colsample_bytree']['low'], search_space['colsample_bytree']['high']),
+        'seed': params['random_state'],
+        'tree_method': 'hist',
+        'device': device,
+        'eval_metric': 'rmse',
+        'verbosity': 0
+    }
+    if nthread is not None:
+        param['nthread'] = nthread
+    booster = xgb.train(param, dtrain, num_boost_round=num_boost_round, evals=[(dval, 'val')],
+                        callbacks=[XGBoostPruningCallback(trial, 'val-rmse')], verbose_eval=False)
+    return mean_squared_error(y_val, booster.predict(dval))
+
+
+def _storage(url: str):
+    if url and url.startswith('sqlite'):
+        # a relative database path is taken from the project root, not the cwd, and its
+        # directory is created up front: data/ is untracked and Kedro only makes 03_outputs
+        # when the trained model is saved, after the study has already been opened
+        sqlite_url = make_url(url)
+        if sqlite_url.database and sqlite_url.database != ':memory:':
+            database = Path(sqlite_url.database)
+            if not database.is_absolute():
+                database = _PROJECT_ROOT / database
+            database.parent.mkdir(parents=True, exist_ok=True)
+            url = sqlite_url.set(database=str(database)).render_as_string(hide_password=False)
+        return optuna.storages.RDBStorage(url, engine_kwargs={'connect_args': {'timeout': _SQLITE_BUSY_TIMEOUT_S}})
+    return url
+
+
+def _pruner() -> optuna.pruners.BasePruner:
+    return optuna.pruners.MedianPruner(n_warmup_steps=10)
+
+
+def _optimize_worker(study_name: str, storage: str, X_train: pd.DataFrame, y_train: pd.Series,
+                     X_val: pd.DataFrame, y_val: pd.Series, params: Dict[str, Any], device: str,
+                     n_trials: int, timeout: float) -> None:
+    # runs in a loky process: DMatrix objects don't pickle, so each worker bins its own copy
+    # and shares trials with the others through the study storage
+    dtrain = xgb.QuantileDMatrix(X_train, y_train)
+    dval = xgb.QuantileDMatrix(X_val, y_val, ref=dtrain)
+    study = optuna.load_study(study_name=study_name, storage=_storage(storage), pruner=_pruner())
+    # the workers are the parallelism, so each trial fits on a single thread
+    study.optimize(lambda trial: _objective(trial, dtrain, dval, y_val, params, device, nthread=1),
+                   n_trials=n_trials, timeout=timeout, gc_after_trial=True)
 
 
 def train_model(
@@ -56,31 +128,50 @@ def train_model(
     y_train = train_data[target_column]
     X_val = val_data[feature_columns]
     y_val = val_data[target_column]
-
-    def objective(trial):
-        search_space = params['optuna']['search_space']
-        param = {
-            'n_estimators': trial.suggest_int('n_estimators', search_space['n_estimators']['low'], search_space['n_estimators']['high']),
-            'max_depth': trial.suggest_int('max_depth', search_space['max_depth']['low'], search_space['max_depth']['high']),
-            'learning_rate': trial.suggest_float('learning_rate', search_space['learning_rate']['low'], search_space['learning_rate']['high'], log=True),
-            'subsample': trial.suggest_float('subsample', search_space['subsample']['low'], search_space['subsample']['high']),
-            'colsample_bytree': trial.suggest_float('colsample_bytree', search_space['colsample_bytree']['low'], search_space['colsample_bytree']['high']),
-            'random_state': params['random_state'],
-            'verbosity': 0
-        }
-        model = XGBRegressor(**param)
-        model.fit(X_train, y_train)
-        return mean_squared_error(y_val, model.predict(X_val))
+    device = _resolve_device(params)
 
     if params['optuna']['flag_use_optuna']:
-        study = optuna.create_study(direction='minimize')
-        study.optimize(objective, n_trials=params['optuna']['n_trials'], timeout=params['optuna']['timeout'], show_progress_bar=True)
-        best_params = {**study.best_params, 'random_state': params['random_state'], 'verbosity': 0}
+        optuna_params = params['optuna']
+        n_jobs = optuna_params.get('n_jobs') or max(1, min(_MAX_DEFAULT_OPTUNA_JOBS, (os.cpu_count() or 1) // 2))
+        n_trials = optuna_params['n_trials']
+        storage = optuna_params.get('storage')
+        # a fresh study per run: trials from earlier runs were scored on other data or another
+        # split and must not steer the sampler or the pruner; the storage keeps them for reference
+        study = optuna.create_study(
+            direction='minimize',
+            study_name=f"{optuna_params.get('study_name') or 'weather_xgboost'}_{datetime.now():%Y%m%d_%H%M%S_%f}",
+            storage=_storage(storage),
+            pruner=_pruner(),
+        )
+        if storage and n_jobs > 1:
+            # single-threaded trials in parallel processes, coordinated through the shared storage
+            workers = min(n_jobs, n_trials)
+            trials_per_worker = [n_trials // workers + (i < n_trials % workers) for i in range(workers)]
+            Parallel(n_jobs=workers, backend='loky')(
+                delayed(_optimize_worker)(study.study_name, storage, X_train, y_train, X_val, y_val,
+                                          params, device, worker_trials, optuna_params['timeout'])
+                for worker_trials in trials_per_worker
+            )
+        else:
+            # in-memory studies can't be shared across processes and a single worker gains nothing
+            # from one; bin the features once and run here, each trial using every core
+            dtrain = xgb.QuantileDMatrix(X_train, y_train)
+            dval = xgb.QuantileDMatrix(X_val, y_val, ref=dtrain)
+            study.optimize(lambda trial: _objective(trial, dtrain, dval, y_val, params, device),
+                           n_trials=n_trials, timeout=optuna_params['timeout'],
+                           gc_after_trial=True, show_progress_bar=True)
+        completed = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        if not completed:
+            raise RuntimeError("No Optuna trials completed in this run")
+        best_trial = min(completed, key=lambda t: t.value)
+        best_params = {**best_trial.params, 'random_state': params['random_state'], 'tree_method': 'hist', 'device': device, 'verbosity': 0}
         model = XGBRegressor(**best_params)
     else:
-        model = XGBRegressor()
+        model = XGBRegressor(tree_method='hist', device=device)
 
     model.fit(X_train, y_train)
+    # the dashboard predicts single CPU rows; a cuda-pinned model would copy each one to the device
+    model.set_params(device='cpu')
     return model
 
 
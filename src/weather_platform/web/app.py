@@ -1,15 +1,43 @@
 import logging
 import os
 import secrets
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict
+import orjson
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from kedro.framework.session import KedroSession
+from kedro.framework.startup import bootstrap_project
+from .predictor import WeatherPredictor
 from .routes import web_bp
 from .scheduler import init_scheduler
 
 logger = logging.getLogger(__name__)
 
 
-def create_app(project_path: str = None, scheduler_interval: int = 60, enable_scheduler: bool = True):
+class ORJSONProvider(DefaultJSONProvider):
+    # orjson encodes the forecast payload (and any numpy values in it) in C; NaN becomes null
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def _snapshot_params(project_path: Path) -> Dict[str, Any]:
+    bootstrap_project(project_path)
+    with KedroSession.create(project_path=project_path) as session:
+        return session.load_context().params
+
+
+def create_app(project_path: str = None, scheduler_interval: int = 60, enable_scheduler: bool = True,
+               preload_model: bool = False):
     if project_path is None:
         project_path = Path(__file__).parents[3].absolute()
     else:
@@ -23,8 +51,30 @@ def create_app(project_path: str = None, scheduler_interval: int = 60, enable_sc
     app.config['SCHEDULER_INTERVAL'] = scheduler_interval
     app.config['PIPELINE_NAME'] = '__default__'
     app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', secrets.token_hex(32))
+    app.config['DEBUG'] = False
+    app.json = ORJSONProvider(app)
+    app.json.compact = True
+    app.url_map.strict_slashes = False
 
     app.register_blueprint(web_bp)
+    # shared pool for running independent parts of a request side by side; threads are
+    # started on first use, so creating it before a pre-fork is safe
+    app.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='forecast')
+
+    if preload_model:
+        # attach to the app object itself (current_app only exists inside a request) so that a
+        # pre-forking server loads the model once and workers share it copy-on-write
+        app.predictor = WeatherPredictor(app.config['KEDRO_PROJECT_PATH'])
+        try:
+            app.predictor.load_model()
+            logger.info("Predictor and model preloaded")
+        except Exception as e:
+            # no trained model yet: start anyway and load it on first use, as before
+            logger.warning(f"Model not preloaded, it will load on first use: {e}")
+
+    # parameters.yml is read once here; routes and the scheduler use this snapshot, so a
+    # config change takes effect on restart
+    app.config['PARAMS'] = app.predictor.params if preload_model else _snapshot_params(project_path)
 
     if enable_scheduler:
         try:
@@ -1,54 +1,153 @@
 import os
-from datetime import datetime, timedelta
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import numpy as np
 from kedro.framework.session import KedroSession
+from kedro.io import DataCatalog
 from kedro.framework.startup import bootstrap_project
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+import shap
+
+_HISTORICAL_COLUMNS = ['year', 'month', 'day', 'hour', 'tmpf']
+_TEMPERATURE_COLUMNS = ['year', 'month', 'day', 'hour', 'temperature', 'timestamp']
+_BASE_FEATURES = ['ft_month', 'ft_day', 'ft_hour', 'ft_days_since_2000', 'ft_temp']
+_TRACKED_DATASETS = ['trained_model', 'model_metrics', 'raw_weather_data']
+_MTIME_TTL_SECONDS = 1.0
+_HOURS_PER_YEAR_KEY = 12 * 31 * 24
+# XGBoost bins and predicts in float32; building features in it avoids a cast copy per call
+_FEATURE_DTYPE = np.float32
+_FEATURE_DISPLAY_NAMES = {
+    'ft_month': 'Month', 'ft_day': 'Day', 'ft_hour': 'Hour',
+    'ft_days_since_2000': 'Days Since 2000', 'ft_temp': 'Current Temp',
+    **{f'ft_temp_lag_{i}h': f'Temp Lag {i}h' for i in range(1, 10)},
+}
+
+
+def _hour_key(year, month, day, hour):
+    # single sortable int64 per (year, month, day, hour); works elementwise on arrays
+    return ((year * 12 + (month - 1)) * 31 + (day - 1)) * 24 + hour
+
+
+def _naive_epoch_seconds(dt: datetime) -> float:
+    # wall-clock seconds, ignoring any tz offset, to match the naive pandas arithmetic in create_features
+    return dt.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _roll_lags(temp_chain: np.ndarray, new_temp: float):
+    temp_chain[1:] = temp_chain[:-1]
+    temp_chain[0] = new_temp
+
+
+# every live predictor, so one fork hook can reset them all without keeping any alive
+_live_predictors = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    # the scheduler opens the connection in the gunicorn master, and workers it forks later
+    # would inherit it (and maybe a held lock). The parent's connection is parked rather than
+    # closed: SQLite handles must not be used or closed across a fork, and the child opens
+    # its own on first use
+    for predictor in list(_live_predictors):
+        if predictor._temperatures_conn is not None:
+            predictor._inherited_conns.append(predictor._temperatures_conn)
+            predictor._temperatures_conn = None
+        predictor._temperatures_lock = threading.Lock()
+        predictor._historical_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 class WeatherPredictor:
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, catalog: Optional[DataCatalog] = None,
+                 params: Optional[Dict[str, Any]] = None):
         self.project_path = Path(project_path)
         self._model = None
         self._model_timestamp = None
         self._metrics = None
         self._metrics_timestamp = None
-        self._params = None
+        self._historical = None
+        self._historical_timestamp = None
+        self._historical_lock = threading.Lock()
+        self._explainer = None
+        self._explainer_model = None
         self.inference_dir = self.project_path / 'data' / '04_inference'
         self.inference_dir.mkdir(parents=True, exist_ok=True)
-        self.temperatures_file = self.inference_dir / 'temperatures.parquet'
-        bootstrap_project(self.project_path)
-
-    def _get_file_mtime(self, filename: str) -> Optional[float]:
-        try:
+        self.temperatures_db = self.inference_dir / 'temperatures.db'
+        self._temperatures_conn = None
+        self._inherited_conns = []
+        self._temperatures_lock = threading.Lock()
+        self._scratch = threading.local()
+        _live_predictors.add(self)
+        # a caller that already has the catalog and parameters (tests, tools) skips the session
+        if catalog is None or params is None:
+            bootstrap_project(self.project_path)
             with KedroSession.create(project_path=self.project_path) as session:
                 context = session.load_context()
-                dataset = context.catalog._datasets.get(filename)
-                if dataset and hasattr(dataset, '_filepath'):
-                    filepath = dataset._filepath
-                    if os.path.exists(filepath):
-                        return os.path.getmtime(filepath)
-        except Exception:
-            pass
-        return None
+            catalog = context.catalog if catalog is None else catalog
+            params = context.params if params is None else params
+        self._catalog = catalog
+        self._params = params
+        self._filepaths = {}
+        for name in _TRACKED_DATASETS:
+            dataset = self._catalog.get(name)
+            if dataset and hasattr(dataset, '_filepath'):
+                self._filepaths[name] = Path(str(dataset._filepath))
+        self._mtime_cache = {}
+
+        params = self._load_params()
+        self._feature_cols = params['data_science']['feature_columns']
+        self._feature_indices = {col: i for i, col in enumerate(self._feature_cols)}
+        self._num_lags = params['data_engineering']['num_lags']
+        # column positions to write into; None for features not in feature_columns
+        self._base_slots = [self._feature_indices.get(col) for col in _BASE_FEATURES]
+        self._lag_slots = [self._feature_indices.get(f'ft_temp_lag_{i}h') for i in range(1, self._num_lags + 1)]
+        self._ref_epoch_s = _naive_epoch_seconds(pd.Timestamp(params['data_engineering']['reference_date']).to_pydatetime())
+
+    def _get_filepath(self, filename: str) -> Optional[Path]:
+        return self._filepaths.get(filename)
+
+    def _stat_dataset(self, filename: str) -> Tuple[bool, Optional[float]]:
+        # dashboard polling hits this several times per request; re-stat at most once a second
+        now = time.monotonic()
+        cached = self._mtime_cache.get(filename)
+        if cached is not None and now - cached[0] < _MTIME_TTL_SECONDS:
+            return cached[1]
+
+        result = (False, None)
+        filepath = self._get_filepath(filename)
+        if filepath:
+            try:
+                result = (True, os.stat(filepath).st_mtime)
+            except OSError:
+                pass
+        self._mtime_cache[filename] = (now, result)
+        return result
+
+    def _get_file_mtime(self, filename: str) -> Optional[float]:
+        return self._stat_dataset(filename)[1]
 
     def _load_params(self) -> Dict[str, Any]:
-        if self._params is None:
-            with KedroSession.create(project_path=self.project_path) as session:
-                context = session.load_context()
-                self._params = context.params
         return self._params
 
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self._load_params()
+
     def load_model(self):
         try:
             current_mtime = self._get_file_mtime("trained_model")
             if self._model is None or current_mtime != self._model_timestamp:
-                with KedroSession.create(project_path=self.project_path) as session:
-                    context = session.load_context()
-                    self._model = context.catalog.load("trained_model")
-                    self._model_timestamp = current_mtime
+                self._model = self._catalog.load("trained_model")
+                self._model_timestamp = current_mtime
             return self._model
         except Exception as e:
             raise RuntimeError(f"Failed to load model: {str(e)}")
@@ -57,13 +156,11 @@ class WeatherPredictor:
         try:
             current_mtime = self._get_file_mtime("model_metrics")
             if self._metrics is None or current_mtime != self._metrics_timestamp:
-                with KedroSession.create(project_path=self.project_path) as session:
-                    context = session.load_context()
-                    self._metrics = context.catalog.load("model_metrics")
-                    self._metrics_timestamp = current_mtime
+                self._metrics = self._catalog.load("model_metrics")
+                self._metrics_timestamp = current_mtime
             metrics = self._metrics.copy() if self._metrics else {}
             metrics['last_updated'] = datetime.fromtimestamp(self._metrics_timestamp).strftime('%Y-%m-%d %H:%M:%S') if self._metrics_timestamp else 'Unknown'
-            metrics['model_exists'] = self._model is not None or os.path.exists(self.project_path / 'data' / '03_outputs' / 'weather_model.pkl')
+            metrics['model_exists'] = self._model is not None or self._stat_dataset("trained_model")[0]
             return metrics
         except Exception as e:
             return {
@@ -71,185 +168,268 @@ class WeatherPredictor:
                 'last_updated': 'N/A', 'model_exists': False, 'error': str(e)
             }
 
-    def _load_temperatures_df(self) -> pd.DataFrame:
-        if self.temperatures_file.exists():
-            return pd.read_parquet(self.temperatures_file)
-        return pd.DataFrame(columns=['year', 'month', 'day', 'hour', 'temperature', 'timestamp'])
-
-    def _save_temperatures_df(self, df: pd.DataFrame):
-        df.to_parquet(self.temperatures_file, index=False)
+    def _legacy_temperature_rows(self) -> List[tuple]:
+        # readings saved before the SQLite table: the original temperatures.parquet and the
+        # hive year=/month= record directory that briefly replaced it
+        frames = []
+        for path in (self.inference_dir / 'temperatures.parquet', self.inference_dir / 'temperatures'):
+            if path.exists():
+                frames.append(pd.read_parquet(path)[_TEMPERATURE_COLUMNS])
+        if not frames:
+            return []
+        legacy = pd.concat(frames, ignore_index=True).dropna(subset=_TEMPERATURE_COLUMNS[:5])
+        return list(zip(
+            *(legacy[col].astype('int64').tolist() for col in _TEMPERATURE_COLUMNS[:4]),
+            legacy['temperature'].astype('float64').tolist(),
+            legacy['timestamp'].astype(str).tolist(),
+        ))
+
+    def _get_temperatures_conn(self) -> sqlite3.Connection:
+        if self._temperatures_conn is None:
+            conn = sqlite3.connect(self.temperatures_db, check_same_thread=False)
+            with conn:
+                created = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'temps'"
+                ).fetchone() is None
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS temps ("
+                    "year INTEGER, month INTEGER, day INTEGER, hour INTEGER, "
+                    "temperature REAL, timestamp TEXT, "
+                    "PRIMARY KEY (year, month, day, hour))"
+                )
+            if created:
+                # one-time import when the table is first created; a bad legacy file is reported
+                # and skipped so new readings are still stored
+                try:
+                    rows = self._legacy_temperature_rows()
+                    with conn:
+                        imported = conn.executemany("INSERT OR IGNORE INTO temps VALUES (?, ?, ?, ?, ?, ?)", rows).rowcount
+                    if rows:
+                        print(f"[API] Imported {imported} legacy temperature records")
+                except Exception as e:
+                    print(f"[API] Legacy temperature import failed: {e}")
+            self._temperatures_conn = conn
+        return self._temperatures_conn
 
     def save_temperature(self, dt: datetime, temperature: float):
-        df = self._load_temperatures_df()
         dt_naive = dt.replace(tzinfo=None) if dt.tzinfo else dt
-        exists = (
-            (df['year'] == dt_naive.year) &
-            (df['month'] == dt_naive.month) &
-            (df['day'] == dt_naive.day) &
-            (df['hour'] == dt_naive.hour)
-        ).any()
 
         print(f"[API] year={dt_naive.year} month={dt_naive.month:02d} day={dt_naive.day:02d} hour={dt_naive.hour:02d} temp={temperature:.1f}F timestamp={dt_naive.isoformat()}")
 
-        if not exists:
-            new_row = pd.DataFrame([{
-                'year': dt_naive.year,
-                'month': dt_naive.month,
-                'day': dt_naive.day,
-                'hour': dt_naive.hour,
-                'temperature': temperature,
-                'timestamp': dt_naive.isoformat()
-            }])
-            df = pd.concat([df, new_row], ignore_index=True)
-            self._save_temperatures_df(df)
+        with self._temperatures_lock:
+            conn = self._get_temperatures_conn()
+            with conn:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO temps VALUES (?, ?, ?, ?, ?, ?)",
+                    (dt_naive.year, dt_naive.month, dt_naive.day, dt_naive.hour, float(temperature), dt_naive.isoformat())
+                ).rowcount
+        if inserted:
             print(f"[API] Saved new temperature record")
 
     def load_temperature(self, dt: datetime) -> Optional[float]:
-        df = self._load_temperatures_df()
         dt_naive = dt.replace(tzinfo=None) if dt.tzinfo else dt
-        match = df[
-            (df['year'] == dt_naive.year) &
-            (df['month'] == dt_naive.month) &
-            (df['day'] == dt_naive.day) &
-            (df['hour'] == dt_naive.hour)
-        ]
-        if not match.empty:
-            return float(match.iloc[0]['temperature'])
+        with self._temperatures_lock:
+            row = self._get_temperatures_conn().execute(
+                "SELECT temperature FROM temps WHERE year = ? AND month = ? AND day = ? AND hour = ?",
+                (dt_naive.year, dt_naive.month, dt_naive.day, dt_naive.hour)
+            ).fetchone()
+        if row is not None:
+            return float(row[0])
         return None
 
     def get_lag_temperatures(self, dt: datetime) -> List[Optional[float]]:
-        params = self._load_params()
-        num_lags = params['data_engineering']['num_lags']
-        lags = []
-        for i in range(1, num_lags + 1):
-            lag_time = dt - timedelta(hours=i)
-            temp = self.load_temperature(lag_time)
-            lags.append(temp)
-        return lags
-
-    def _compute_days_since_reference(self, dt: datetime) -> float:
-        params = self._load_params()
-        reference_date = pd.Timestamp(params['data_engineering']['reference_date'])
         dt_naive = dt.replace(tzinfo=None) if dt.tzinfo else dt
-        return (pd.Timestamp(dt_naive) - reference_date).total_seconds() / (24 * 3600)
+        lag_hours = [dt_naive - timedelta(hours=i) for i in range(1, self._num_lags + 1)]
+        if not lag_hours:
+            return []
+        keys = [(t.year, t.month, t.day, t.hour) for t in lag_hours]
+        # one query for every lag hour instead of num_lags round trips; a bare IN (VALUES ...)
+        # scans the whole table, the SELECT wrapper lets SQLite probe the primary key per row
+        placeholders = ", ".join(["(?, ?, ?, ?)"] * len(keys))
+        with self._temperatures_lock:
+            rows = self._get_temperatures_conn().execute(
+                f"SELECT year, month, day, hour, temperature FROM temps "
+                f"WHERE (year, month, day, hour) IN (SELECT * FROM (VALUES {placeholders}))",
+                [part for key in keys for part in key]
+            ).fetchall()
+        found = {tuple(row[:4]): float(row[4]) for row in rows}
+        return [found.get(key) for key in keys]
 
-    def _build_features(self, dt: datetime, temp: float, lag_temps: List[Optional[float]]) -> np.ndarray:
-        params = self._load_params()
-        feature_cols = params['data_science']['feature_columns']
-
-        features_dict = {
-            'ft_month': dt.month,
-            'ft_day': dt.day,
-            'ft_hour': dt.hour,
-            'ft_days_since_2000': self._compute_days_since_reference(dt),
-            'ft_temp': temp
-        }
+    def _compute_days_since_reference(self, dt: datetime) -> float:
+        return (_naive_epoch_seconds(dt) - self._ref_epoch_s) / 86400.0
+
+    def _build_features(self, dt: datetime, temp: float, lag_temps: List[Optional[float]],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        features = out if out is not None else np.full((1, len(self._feature_cols)), np.nan, dtype=_FEATURE_DTYPE)
+        base_values = (dt.month, dt.day, dt.hour, self._compute_days_since_reference(dt), temp)
+        for slot, value in zip(self._base_slots, base_values):
+            if slot is not None:
+                features[0, slot] = value
+        for slot, lag_temp in zip(self._lag_slots, lag_temps):
+            if slot is not None:
+                features[0, slot] = np.nan if lag_temp is None else lag_temp
+        return features
+
+    def _scratch_row(self) -> np.ndarray:
+        # one reusable (1, n) feature row per request thread, reset to NaN before each use
+        row = getattr(self._scratch, 'row', None)
+        if row is None:
+            row = self._scratch.row = np.empty((1, len(self._feature_cols)), dtype=_FEATURE_DTYPE)
+        row.fill(np.nan)
+        return row
+
+    def _features_dict(self, dt: datetime, temp: float, lag_temps: List[Optional[float]]) -> Dict[str, Any]:
+        features_dict = dict(zip(_BASE_FEATURES, (dt.month, dt.day, dt.hour, self._compute_days_since_reference(dt), temp)))
         for i, lag_temp in enumerate(lag_temps, 1):
             features_dict[f'ft_temp_lag_{i}h'] = lag_temp
-
-        features_list = [features_dict.get(col, np.nan) for col in feature_cols]
-        return np.array([features_list]), features_dict
+        return features_dict
 
     def predict(self, dt: datetime, temp: float, lag_temps: List[Optional[float]]) -> Dict[str, Any]:
-        model = self.load_model()
-        features, features_dict = self._build_features(dt, temp, lag_temps)
-        prediction = model.predict(features)[0]
+        booster = self.load_model().get_booster()
+        features = self._build_features(dt, temp, lag_temps, out=self._scratch_row())
+        # already float32 in feature_columns order: skip the sklearn wrapper's DMatrix copy
+        prediction = booster.inplace_predict(features, validate_features=False)[0]
 
         return {
             'prediction': float(prediction),
-            'input_features': features_dict,
+            'input_features': self._features_dict(dt, temp, lag_temps),
             'model_timestamp': datetime.fromtimestamp(self._model_timestamp).strftime('%Y-%m-%d %H:%M:%S') if self._model_timestamp else 'Unknown'
         }
 
+    def _build_calendar_block(self, start_time: datetime, periods: int) -> np.ndarray:
+        # month/day/hour/day-offset for every step at once; temperature slots are left NaN
+        start_naive = start_time.replace(tzinfo=None) if start_time.tzinfo else start_time
+        times = pd.date_range(start_naive, periods=periods, freq='h')
+        days_since = (_naive_epoch_seconds(start_naive) + 3600.0 * np.arange(periods) - self._ref_epoch_s) / 86400.0
+        features = np.full((periods, len(self._feature_cols)), np.nan, dtype=_FEATURE_DTYPE)
+        for slot, values in zip(self._base_slots, (times.month, times.day, times.hour, days_since)):
+            if slot is not None:
+                features[:, slot] = values
+        return features
+
     def predict_24h(self, start_time: datetime, current_temp: float) -> List[Dict[str, Any]]:
-        model = self.load_model()
+        booster = self.load_model().get_booster()
         lag_temps = self.get_lag_temperatures(start_time)
-        predictions = []
-        current_temp_val = current_temp
-
-        for i in range(24):
-            future_time = start_time + timedelta(hours=i)
-            features, features_dict = self._build_features(future_time, current_temp_val, lag_temps)
-            predicted_temp = float(model.predict(features)[0])
+        future_times = [start_time + timedelta(hours=i) for i in range(24)]
 
-            predictions.append({
-                "time": future_time.isoformat(),
-                "hour": future_time.hour,
-                "predicted_temperature": predicted_temp
-            })
+        # [temp, lag_1h, ..., lag_nh] is fed back into itself one hour at a time
+        temp_chain = np.array([current_temp] + lag_temps, dtype=_FEATURE_DTYPE)
+        features = self._build_calendar_block(start_time, 24)
+        temp_slots = [(slot, pos) for pos, slot in enumerate([self._base_slots[-1]] + self._lag_slots) if slot is not None]
+        predicted = np.empty(24, dtype=_FEATURE_DTYPE)
 
-            lag_temps = [current_temp_val] + lag_temps[:-1]
-            current_temp_val = predicted_temp
+        # each step feeds on the previous prediction, so calls stay sequential and only the
+        # temperature slots of the step's row are filled; the column layout is fixed by
+        # _feature_indices, so per-call feature validation is skipped
+        for i in range(24):
+            row = features[i:i + 1]
+            for slot, pos in temp_slots:
+                row[0, slot] = temp_chain[pos]
+            predicted[i] = booster.inplace_predict(row, validate_features=False)[0]
+            _roll_lags(temp_chain, predicted[i])
+
+        return [
+            {"time": future_time.isoformat(), "hour": future_time.hour, "predicted_temperature": predicted_temp}
+            for future_time, predicted_temp in zip(future_times, predicted.tolist())
+        ]
 
-        return predictions
+    def _load_historical_frame(self) -> pd.DataFrame:
+        raw_path = self._get_filepath("raw_weather_data")
+        cache_path = raw_path.with_name(f"{raw_path.stem}.cached.parquet")
+        # one rebuild per process at a time; other workers only ever see a complete sidecar
+        with self._historical_lock:
+            try:
+                stale = cache_path.stat().st_mtime < raw_path.stat().st_mtime
+            except FileNotFoundError:
+                stale = True
+            if stale:
+                raw_data = self._catalog.load("raw_weather_data")
+                if not is_datetime64_any_dtype(raw_data['valid']):
+                    raw_data['valid'] = pd.to_datetime(raw_data['valid'], errors='coerce', cache=True)
+                if not is_numeric_dtype(raw_data['tmpf']):
+                    raw_data['tmpf'] = pd.to_numeric(raw_data['tmpf'], errors='coerce').astype('float64')
+                raw_data = raw_data.dropna(subset=['valid', 'tmpf'])
+                valid = raw_data['valid'].dt
+                # only the pre-extracted hour parts are kept, so reloads never touch the timestamps;
+                # tmpf stays float64 so served values aren't float32-rounded
+                frame = pd.DataFrame({
+                    'year': valid.year.astype('int16'),
+                    'month': valid.month.astype('int16'),
+                    'day': valid.day.astype('int16'),
+                    'hour': valid.hour.astype('int16'),
+                    'tmpf': raw_data['tmpf'].astype('float64'),
+                })
+                # write beside the sidecar and rename over it, so a reader never parses a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix='.tmp')
+                os.close(fd)
+                try:
+                    frame.to_parquet(tmp_path, index=False, compression='zstd')
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    Path(tmp_path).unlink(missing_ok=True)
+                    raise
+            return pd.read_parquet(cache_path, columns=_HISTORICAL_COLUMNS)
+
+    def _load_historical_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        current_mtime = self._get_file_mtime("raw_weather_data")
+        if self._historical is None or current_mtime != self._historical_timestamp:
+            raw_data = self._load_historical_frame()
+            keys = _hour_key(*(raw_data[col].to_numpy(dtype=np.int64) for col in ['year', 'month', 'day', 'hour']))
+
+            # sorted unique hours, keeping the first observation of each as the row-by-row lookup did
+            unique_keys, first_rows = np.unique(keys, return_index=True)
+            self._historical = (unique_keys, raw_data['tmpf'].to_numpy()[first_rows])
+            self._historical_timestamp = current_mtime
+        return self._historical
 
     def get_historical_temperatures(self, start_time: datetime, num_years: int = 5) -> List[Dict[str, Any]]:
         try:
-            with KedroSession.create(project_path=self.project_path) as session:
-                context = session.load_context()
-                raw_data = context.catalog.load("raw_weather_data")
-
-            raw_data['valid'] = pd.to_datetime(raw_data['valid'], errors='coerce')
-            raw_data['tmpf'] = pd.to_numeric(raw_data['tmpf'], errors='coerce')
-            raw_data = raw_data.dropna(subset=['valid', 'tmpf'])
-            raw_data['month'] = raw_data['valid'].dt.month
-            raw_data['day'] = raw_data['valid'].dt.day
-            raw_data['hour'] = raw_data['valid'].dt.hour
-            raw_data['year'] = raw_data['valid'].dt.year
+            keys, temps = self._load_historical_index()
 
             current_year = start_time.year
-            available_years = sorted(raw_data['year'].unique(), reverse=True)
-            historical_years = [y for y in available_years if y < current_year][:num_years]
-            historical_data = []
-
-            for year in historical_years:
-                year_temps = []
-                for i in range(24):
-                    future_time = start_time + timedelta(hours=i)
-                    matching = raw_data[
-                        (raw_data['year'] == year) &
-                        (raw_data['month'] == future_time.month) &
-                        (raw_data['day'] == future_time.day) &
-                        (raw_data['hour'] == future_time.hour)
-                    ]
-                    if not matching.empty:
-                        year_temps.append(float(matching['tmpf'].iloc[0]))
-                    else:
-                        year_temps.append(None)
-                historical_data.append({'year': int(year), 'temperatures': year_temps})
-            return historical_data
+            available_years = np.unique(keys // _HOURS_PER_YEAR_KEY)[::-1]
+            historical_years = available_years[available_years < current_year][:num_years]
+            start_naive = start_time.replace(tzinfo=None) if start_time.tzinfo else start_time
+            times = pd.date_range(start_naive, periods=24, freq='h')
+
+            # one (years, 24) grid of hour keys resolved with a single searchsorted
+            targets = _hour_key(historical_years[:, None], times.month.to_numpy(),
+                                times.day.to_numpy(), times.hour.to_numpy())
+            positions = np.minimum(np.searchsorted(keys, targets), len(keys) - 1)
+            found = keys[positions] == targets
+            grid = np.where(found, temps[positions], np.nan).tolist()
+            hits = found.tolist()
+
+            return [
+                {'year': int(year), 'temperatures': [t if hit else None for t, hit in zip(year_temps, year_hits)]}
+                for year, year_temps, year_hits in zip(historical_years.tolist(), grid, hits)
+            ]
         except Exception:
             return []
 
     def get_shap_contributions(self, dt: datetime, temp: float, lag_temps: List[Optional[float]]) -> Dict[str, Any]:
-        import shap
         model = self.load_model()
-        params = self._load_params()
-        feature_cols = params['data_science']['feature_columns']
+        feature_cols = self._feature_cols
 
-        features, _ = self._build_features(dt, temp, lag_temps)
+        features = self._build_features(dt, temp, lag_temps, out=self._scratch_row())
 
-        feature_display_names = {
-            'ft_month': 'Month', 'ft_day': 'Day', 'ft_hour': 'Hour',
-            'ft_days_since_2000': 'Days Since 2000', 'ft_temp': 'Current Temp'
-        }
-        for i in range(1, 10):
-            feature_display_names[f'ft_temp_lag_{i}h'] = f'Temp Lag {i}h'
-
-        explainer = shap.TreeExplainer(model)
-        shap_values = explainer.shap_values(features)
+        # rebuilt only when load_model hands back a different model object
+        if self._explainer is None or self._explainer_model is not model:
+            self._explainer = shap.TreeExplainer(model)
+            self._explainer_model = model
+        explainer = self._explainer
+        shap_values = explainer.shap_values(features, check_additivity=False)
 
-        abs_shap = np.abs(shap_values[0])
+        row = shap_values[0]
+        abs_shap = np.abs(row)
         total = abs_shap.sum()
         percentages = (abs_shap / total) * 100 if total > 0 else np.zeros_like(abs_shap)
 
-        contributions = []
-        for i, col in enumerate(feature_cols):
-            contributions.append({
-                'feature': feature_display_names.get(col, col),
-                'percentage': float(percentages[i]),
-                'shap_value': float(shap_values[0][i])
-            })
-        contributions.sort(key=lambda x: x['percentage'], reverse=True)
+        # one tolist() per array instead of boxing every element through float()
+        rows = sorted(zip(feature_cols, percentages.tolist(), row.tolist()), key=lambda r: r[1], reverse=True)
+        contributions = [
+            {'feature': _FEATURE_DISPLAY_NAMES.get(col, col), 'percentage': pct, 'shap_value': value}
+            for col, pct, value in rows
+        ]
 
         return {'contributions': contributions, 'base_value': float(explainer.expected_value)}
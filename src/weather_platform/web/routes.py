@@ -1,20 +1,10 @@
 from pathlib import Path
 from flask import Blueprint, render_template, jsonify, current_app
-from kedro.framework.session import KedroSession
-from kedro.framework.startup import bootstrap_project
 from .predictor import WeatherPredictor
 from .weather_api import get_current_weather
 from . import weather_bot
 
 web_bp = Blueprint('web', __name__)
-_bootstrapped = False
-
-
-def ensure_bootstrap(project_path):
-    global _bootstrapped
-    if not _bootstrapped:
-        bootstrap_project(project_path)
-        _bootstrapped = True
 
 
 def get_predictor():
@@ -36,20 +26,18 @@ def index():
 @web_bp.route('/api/forecast')
 def forecast():
     try:
-        ensure_bootstrap(current_app.config['KEDRO_PROJECT_PATH'])
-        with KedroSession.create(project_path=current_app.config['KEDRO_PROJECT_PATH']) as session:
-            context = session.load_context()
-            dashboard_config = context.params.get('dashboard', {})
-            location_config = dashboard_config.get('location', {})
-            lat = location_config.get('latitude')
-            lon = location_config.get('longitude')
-            location_name = location_config.get('name', 'Unknown')
-
-            if lat is None or lon is None:
-                return jsonify({
-                    'success': False,
-                    'error': 'Location coordinates not configured in parameters.yml'
-                }), 500
+        params = current_app.config['PARAMS']
+        dashboard_config = params.get('dashboard', {})
+        location_config = dashboard_config.get('location', {})
+        lat = location_config.get('latitude')
+        lon = location_config.get('longitude')
+        location_name = location_config.get('name', 'Unknown')
+
+        if lat is None or lon is None:
+            return jsonify({
+                'success': False,
+                'error': 'Location coordinates not configured in parameters.yml'
+            }), 500
 
         weather_data = get_current_weather(lat, lon)
         predictor = get_predictor()
@@ -58,20 +46,24 @@ def forecast():
 
         predictor.save_temperature(start_time, current_temp)
         lag_temps = predictor.get_lag_temperatures(start_time)
-        predictions = predictor.predict_24h(start_time=start_time, current_temp=current_temp)
-        historical = predictor.get_historical_temperatures(start_time=start_time, num_years=5)
+        # the forecast and the history lookup are independent; run them on the app's pool
+        # while SHAP and the Weather-Bot model load happen on this thread
+        predictions_future = current_app.executor.submit(predictor.predict_24h, start_time=start_time, current_temp=current_temp)
+        historical_future = current_app.executor.submit(predictor.get_historical_temperatures, start_time=start_time, num_years=5)
         shap_data = predictor.get_shap_contributions(dt=start_time, temp=current_temp, lag_temps=lag_temps)
 
         project_path = current_app.config['KEDRO_PROJECT_PATH']
-        ai_config = context.params.get('ai', {})
+        ai_config = params.get('ai', {})
         model_path = ai_config.get('model_path', 'data/05_ai/tinyllama')
         model_name = ai_config.get('model_name', 'TinyLlama')
         weather_bot.load_model(str(Path(project_path) / model_path))
+        predictions = predictions_future.result()
+        historical = historical_future.result()
         bot_summary = weather_bot.generate_forecast_summary(predictions, current_temp, location_name)
 
-        data_science_config = context.params.get('data_science', {})
+        data_science_config = params.get('data_science', {})
         feature_columns = data_science_config.get('feature_columns', [])
-        data_engineering_config = context.params.get('data_engineering', {})
+        data_engineering_config = params.get('data_engineering', {})
         num_lags = data_engineering_config.get('num_lags', 3)
 
         return jsonify({
@@ -2,37 +2,29 @@ import logging
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from .predictor import WeatherPredictor
 
 logger = logging.getLogger(__name__)
 
 
-def update_forecast(app):
+def update_forecast(app, predictor: WeatherPredictor):
     with app.app_context():
         try:
             start_time = datetime.now()
             logger.info("Starting hourly forecast update")
 
-            from .predictor import WeatherPredictor
             from .weather_api import get_current_weather
-            from kedro.framework.session import KedroSession
-            from kedro.framework.startup import bootstrap_project
 
-            project_path = app.config['KEDRO_PROJECT_PATH']
-            bootstrap_project(project_path)
-
-            with KedroSession.create(project_path=project_path) as session:
-                context = session.load_context()
-                dashboard_config = context.params.get('dashboard', {})
-                location_config = dashboard_config.get('location', {})
-                lat = location_config.get('latitude')
-                lon = location_config.get('longitude')
+            dashboard_config = app.config['PARAMS'].get('dashboard', {})
+            location_config = dashboard_config.get('location', {})
+            lat = location_config.get('latitude')
+            lon = location_config.get('longitude')
 
             if lat is None or lon is None:
                 logger.error("Location coordinates not configured")
                 return
 
             weather_data = get_current_weather(lat, lon)
-            predictor = WeatherPredictor(project_path)
 
             current_temp = weather_data['temperature']
             start_time_weather = weather_data['start_time']
@@ -51,9 +43,19 @@ def init_scheduler(app) -> BackgroundScheduler:
 
     interval_minutes = app.config.get('SCHEDULER_INTERVAL', 60)
 
+    # one predictor for the process lifetime, shared with the request handlers
+    if not hasattr(app, 'predictor'):
+        app.predictor = WeatherPredictor(app.config['KEDRO_PROJECT_PATH'])
+    predictor = app.predictor
+    try:
+        predictor.load_model()
+    except Exception as e:
+        # temperature collection doesn't need the model, so keep scheduling without it
+        logger.warning(f"Model not loaded, scheduler will run without it: {e}")
+
     scheduler.add_job(
         func=update_forecast,
-        args=[app],
+        args=[app, predictor],
         trigger=IntervalTrigger(minutes=interval_minutes),
         id='forecast_update_job',
         name='Update Forecast',
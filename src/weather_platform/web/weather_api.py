@@ -1,6 +1,34 @@
 import requests
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# one keep-alive session for every weather.gov call, so the points and forecast
+# requests share a TLS connection; transient gateway errors are retried with backoff
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': '(Weather Platform Dashboard, contact@example.com)'
+})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
+# (scale, offset) taking each unit weather.gov may report to Fahrenheit
+_TO_FAHRENHEIT = {'F': (1.0, 0.0), 'C': (9 / 5, 32.0)}
+
+
+@lru_cache(maxsize=128)
+def _get_forecast_url(lat: float, lon: float) -> str:
+    # a gridpoint's forecast URL never changes, so /points is only hit once per location;
+    # failed lookups raise and are not cached
+    points_url = f"https://api.weather.gov/points/{lat},{lon}"
+    points_response = _SESSION.get(points_url, timeout=10)
+    points_response.raise_for_status()
+    return points_response.json()["properties"]["forecast"]
 
 
 def get_current_weather(lat: float, lon: float) -> Dict[str, Any]:
@@ -24,17 +52,8 @@ def get_current_weather(lat: float, lon: float) -> Dict[str, Any]:
         KeyError: If response format is unexpected
         ValueError: If temperature unit is not Fahrenheit
     """
-    headers = {
-        'User-Agent': '(Weather Platform Dashboard, contact@example.com)'
-    }
-
-    points_url = f"https://api.weather.gov/points/{lat},{lon}"
-    points_response = requests.get(points_url, headers=headers, timeout=10)
-    points_response.raise_for_status()
-    points_data = points_response.json()
-
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_response = requests.get(forecast_url, headers=headers, timeout=10)
+    forecast_url = _get_forecast_url(round(lat, 4), round(lon, 4))
+    forecast_response = _SESSION.get(forecast_url, timeout=10)
     forecast_response.raise_for_status()
     forecast_data = forecast_response.json()
 
@@ -46,12 +65,12 @@ def get_current_weather(lat: float, lon: float) -> Dict[str, Any]:
     temperature = float(first_period["temperature"])
     temperature_unit = first_period["temperatureUnit"]
 
-    if temperature_unit != "F":
-        if temperature_unit == "C":
-            temperature = (temperature * 9/5) + 32
-            temperature_unit = "F"
-        else:
-            raise ValueError(f"Unexpected temperature unit: {temperature_unit}")
+    try:
+        scale, offset = _TO_FAHRENHEIT[temperature_unit]
+    except KeyError:
+        raise ValueError(f"Unexpected temperature unit: {temperature_unit}") from None
+    temperature = temperature * scale + offset
+    temperature_unit = "F"
 
     return {
         "start_time": start_time,
@@ -1,22 +1,49 @@
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 _model = None
 _tokenizer = None
+_newline_id = None
+_blank_ids = frozenset()
+_dummy_prefix_len = 0
+_prefix_ids = None
+_load_lock = threading.Lock()
+
+_PERIODS = ('morning', 'afternoon', 'evening', 'night')
+# period index for each hour of the day: morning 5-11, afternoon 12-16, evening 17-20, night otherwise
+_HOUR_TO_PERIOD = np.array([3] * 5 + [0] * 7 + [1] * 5 + [2] * 4 + [3] * 3, dtype=np.intp)
+
+# the system prompt never changes, so it is tokenized once at load time
+_PROMPT_PREFIX = """<|system|>
+You are a weather assistant. Write one short, friendly natural sentence summarizing the forecast. Use phrases like "this morning", "in the afternoon", "tonight". Mention specific temperatures useing °F. Never use the word 'temperature'. Mention changes in temperature. Keep it under 30 words.
+</s>
+<|user|>"""
+_PROMPT_SUFFIX = """
+Current: {current_temp:.0f}°F. Forecast: {forecast_summary}
+</s>
+<|assistant|>
+"""
 
 
 def load_model(model_path: str):
-    global _model, _tokenizer
+    with _load_lock:
+        _load_model(model_path)
+
+
+def _load_model(model_path: str):
+    global _model, _tokenizer, _newline_id, _blank_ids, _dummy_prefix_len, _prefix_ids
 
     if _model is not None:
         return
 
     try:
-        import torch
-        from transformers import AutoTokenizer, AutoModelForCausalLM
+        from transformers import AutoTokenizer
 
         model_path = Path(model_path)
         if not model_path.exists():
@@ -25,12 +52,72 @@ def load_model(model_path: str):
 
         logger.info(f"Loading Weather-Bot model from {model_path}")
         _tokenizer = AutoTokenizer.from_pretrained(model_path)
-        _model = AutoModelForCausalLM.from_pretrained(model_path, torch_dtype=torch.float16)
+        # sentencepiece encodes "\n" as [▁, <0x0A>]; the last piece is the newline itself
+        newline_ids = _tokenizer.encode("\n", add_special_tokens=False)
+        _newline_id = newline_ids[-1]
+        _blank_ids = frozenset(newline_ids)
+        _dummy_prefix_len = len(newline_ids) - 1
+        model = _load_quantized(model_path)
+        _prefix_ids = _tokenizer(_PROMPT_PREFIX, return_tensors="pt").input_ids.to(model.device)
+        _model = model
         logger.info("Weather-Bot model loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load Weather-Bot model: {e}")
 
 
+def _load_quantized(model_path: Path):
+    # decoding is bound by streaming weights, so load them as int8: bitsandbytes on a GPU,
+    # dynamic qint8 Linear layers on CPU (fp16 has no fast CPU kernels, so start from fp32)
+    import torch
+    from transformers import AutoModelForCausalLM
+
+    if torch.cuda.is_available():
+        try:
+            from transformers import BitsAndBytesConfig
+            import bitsandbytes  # noqa: F401
+            model = AutoModelForCausalLM.from_pretrained(
+                model_path, device_map='auto', quantization_config=BitsAndBytesConfig(load_in_8bit=True)
+            )
+            return model.eval()
+        except ImportError:
+            logger.info("bitsandbytes not installed, falling back to CPU int8")
+
+    torch.set_num_threads(os.cpu_count() or 1)
+    model = AutoModelForCausalLM.from_pretrained(model_path, torch_dtype=torch.float32).eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _bucket_stats(hours: np.ndarray, temps: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # per-period (count, high, low) in _PERIODS order; empty periods keep count 0
+    period_idx = _HOUR_TO_PERIOD[hours]
+    counts = np.bincount(period_idx, minlength=len(_PERIODS))
+    highs = np.full(len(_PERIODS), -np.inf)
+    lows = np.full(len(_PERIODS), np.inf)
+    np.maximum.at(highs, period_idx, temps)
+    np.minimum.at(lows, period_idx, temps)
+    return counts, highs, lows
+
+
+def _encode_suffix(suffix: str) -> List[int]:
+    # only the per-request tail is tokenized; the suffix starts on a newline, so drop the
+    # dummy-prefix piece sentencepiece puts in front of it to match tokenizing the whole prompt
+    return _tokenizer.encode(suffix, add_special_tokens=False)[_dummy_prefix_len:]
+
+
+def _newline_stopping_criteria(prompt_len: int):
+    # only the first line of the reply is kept, so stop decoding once it is complete
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class _StopOnNewline(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            generated = input_ids[0, prompt_len:].tolist()
+            done = bool(generated) and generated[-1] == _newline_id and not _blank_ids.issuperset(generated)
+            return torch.full((input_ids.shape[0],), done, dtype=torch.bool, device=input_ids.device)
+
+    return StoppingCriteriaList([_StopOnNewline()])
+
+
 def generate_forecast_summary(predictions: List[Dict], current_temp: float, location: str) -> Optional[str]:
     global _model, _tokenizer
 
@@ -39,50 +126,37 @@ def generate_forecast_summary(predictions: List[Dict], current_temp: float, loca
 
     try:
         import torch
-        from datetime import datetime
-
-        temps_by_period = {'morning': [], 'afternoon': [], 'evening': [], 'night': []}
-        for pred in predictions[:24]:
-            time = datetime.fromisoformat(pred['time'].replace('Z', '+00:00'))
-            hour = time.hour
-            temp = pred['predicted_temperature']
-            if 5 <= hour < 12:
-                temps_by_period['morning'].append(temp)
-            elif 12 <= hour < 17:
-                temps_by_period['afternoon'].append(temp)
-            elif 17 <= hour < 21:
-                temps_by_period['evening'].append(temp)
-            else:
-                temps_by_period['night'].append(temp)
-
-        summary_parts = []
-        for period, temps in temps_by_period.items():
-            if temps:
-                avg = sum(temps) / len(temps)
-                high = max(temps)
-                low = min(temps)
-                summary_parts.append(f"{period}: high {high:.0f}°F, low {low:.0f}°F")
+
+        # bucket by each prediction's wall-clock hour (already on the dict, no ISO parsing)
+        preds = predictions[:24]
+        hours = np.fromiter((pred['hour'] for pred in preds), dtype=np.int64, count=len(preds))
+        temps = np.fromiter((pred['predicted_temperature'] for pred in preds), dtype=np.float64, count=len(preds))
+        counts, highs, lows = _bucket_stats(hours, temps)
+
+        summary_parts = [
+            f"{period}: high {high:.0f}°F, low {low:.0f}°F"
+            for period, count, high, low in zip(_PERIODS, counts, highs.tolist(), lows.tolist()) if count
+        ]
 
         forecast_summary = "; ".join(summary_parts)
 
-        prompt = f"""<|system|>
-You are a weather assistant. Write one short, friendly natural sentence summarizing the forecast. Use phrases like "this morning", "in the afternoon", "tonight". Mention specific temperatures useing °F. Never use the word 'temperature'. Mention changes in temperature. Keep it under 30 words.
-</s>
-<|user|>
-Current: {current_temp:.0f}°F. Forecast: {forecast_summary}
-</s>
-<|assistant|>
-"""
+        suffix = _PROMPT_SUFFIX.format(current_temp=current_temp, forecast_summary=forecast_summary)
+        prompt = _PROMPT_PREFIX + suffix
 
-        inputs = _tokenizer(prompt, return_tensors="pt")
+        suffix_ids = _encode_suffix(suffix)
+        input_ids = torch.cat([_prefix_ids, torch.tensor([suffix_ids], device=_prefix_ids.device)], dim=1)
+        inputs = {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
 
-        with torch.no_grad():
+        with torch.inference_mode():
             outputs = _model.generate(
                 **inputs,
-                max_new_tokens=200,
+                max_new_tokens=64,
                 do_sample=True,
                 temperature=0.6,
                 top_p=0.9,
+                num_beams=1,
+                use_cache=True,
+                stopping_criteria=_newline_stopping_criteria(inputs["input_ids"].shape[1]),
                 pad_token_id=_tokenizer.eos_token_id,
                 eos_token_id=_tokenizer.eos_token_id
             )
@@ -0,0 +1,18 @@
+"""
+WSGI entry point for pre-forking servers.
+
+The predictor and XGBoost model are loaded at import time, so with gunicorn's
+--preload they are built once in the master and shared copy-on-write by the
+workers instead of being loaded again by each one:
+
+    gunicorn --preload --workers 4 --threads 4 --bind 0.0.0.0:5000 weather_platform.web.wsgi:app
+"""
+import os
+from .app import create_app
+
+app = create_app(
+    project_path=os.getenv('WEATHER_PLATFORM_PROJECT_PATH'),
+    scheduler_interval=int(os.getenv('WEATHER_PLATFORM_SCHEDULER_INTERVAL', '60')),
+    enable_scheduler=os.getenv('WEATHER_PLATFORM_SCHEDULER', '1') != '0',
+    preload_model=True
+)
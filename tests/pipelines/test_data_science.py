@@ -0,0 +1,16 @@
+from weather_platform.pipelines.data_science import nodes
+
+
+def test_sqlite_storage_resolves_against_project_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(nodes, '_PROJECT_ROOT', tmp_path / 'project')
+    monkeypatch.chdir(tmp_path)
+    storage = nodes._storage('sqlite:///data/03_outputs/optuna.db')
+    study = nodes.optuna.create_study(study_name='fresh_checkout', storage=storage)
+    assert study.study_name == 'fresh_checkout'
+    assert (tmp_path / 'project' / 'data' / '03_outputs' / 'optuna.db').exists()
+    assert not (tmp_path / 'data').exists()
+
+
+def test_non_sqlite_storage_is_passed_through():
+    assert nodes._storage(None) is None
+    assert nodes._storage('postgresql://optuna@db/optuna') == 'postgresql://optuna@db/optuna'
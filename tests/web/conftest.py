@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from kedro.io import DataCatalog
+
+from weather_platform.web.predictor import WeatherPredictor
+
+_CONF = Path(__file__).parents[2] / 'conf' / 'base'
+_PREDICTOR_DATASETS = ('raw_weather_data', 'trained_model', 'model_metrics')
+
+
+def raw_weather(seed: int = 0, start: str = '2019-01-01', end: str = '2023-12-31 23:00') -> pd.DataFrame:
+    # hourly ASOS-style rows as they are downloaded: 'M' for missing, some duplicated hours
+    # (a second report half an hour later) and some dropped ones
+    rng = np.random.default_rng(seed)
+    valid = pd.date_range(start, end, freq='h')
+    valid = valid[rng.random(len(valid)) > 0.05]
+    valid = valid.append(valid[rng.choice(len(valid), len(valid) // 80)] + pd.Timedelta(minutes=30)).sort_values()
+    hours = valid.hour.to_numpy()
+    tmpf = np.round(50 + 15 * np.sin((hours - 9) * np.pi / 12) + rng.normal(0, 3, len(valid)), 1).astype(str).astype(object)
+    tmpf[rng.random(len(valid)) < 0.02] = 'M'
+    return pd.DataFrame({'station': 'NYC', 'valid': valid.strftime('%Y-%m-%d %H:%M'), 'tmpf': tmpf})
+
+
+@pytest.fixture
+def project_params():
+    return yaml.safe_load((_CONF / 'parameters.yml').read_text())
+
+
+@pytest.fixture
+def make_predictor(tmp_path, project_params):
+    # the project's own catalog entries and parameters, with every filepath moved under tmp_path
+    config = yaml.safe_load((_CONF / 'catalog.yml').read_text())
+    config = {name: {**config[name], 'filepath': str(tmp_path / config[name]['filepath'])}
+              for name in _PREDICTOR_DATASETS}
+
+    def make(raw_data: pd.DataFrame = None, model=None) -> WeatherPredictor:
+        catalog = DataCatalog.from_config(config)
+        if raw_data is not None:
+            raw_path = Path(config['raw_weather_data']['filepath'])
+            raw_path.parent.mkdir(parents=True, exist_ok=True)
+            raw_data.to_csv(raw_path, index=False)
+        if model is not None:
+            catalog.save('trained_model', model)
+        return WeatherPredictor(tmp_path, catalog=catalog, params=project_params)
+
+    return make
@@ -0,0 +1,256 @@
+import gc
+import os
+import weakref
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from weather_platform.web.predictor import _HOURS_PER_YEAR_KEY, _hour_key
+from conftest import raw_weather
+
+
+def _reference_historical(raw_data: pd.DataFrame, start_time: datetime, num_years: int):
+    # the original row-by-row lookup, on the CSV as pandas reads it by default
+    raw_data = raw_data.astype(str)
+    raw_data['valid'] = pd.to_datetime(raw_data['valid'], errors='coerce')
+    raw_data['tmpf'] = pd.to_numeric(raw_data['tmpf'], errors='coerce')
+    raw_data = raw_data.dropna(subset=['valid', 'tmpf'])
+    for part in ['year', 'month', 'day', 'hour']:
+        raw_data[part] = getattr(raw_data['valid'].dt, part)
+    available_years = sorted(raw_data['year'].unique(), reverse=True)
+    historical = []
+    for year in [y for y in available_years if y < start_time.year][:num_years]:
+        year_temps = []
+        for i in range(24):
+            future_time = start_time + timedelta(hours=i)
+            matching = raw_data[
+                (raw_data['year'] == year) & (raw_data['month'] == future_time.month) &
+                (raw_data['day'] == future_time.day) & (raw_data['hour'] == future_time.hour)
+            ]
+            year_temps.append(float(matching['tmpf'].iloc[0]) if not matching.empty else None)
+        historical.append({'year': int(year), 'temperatures': year_temps})
+    return historical
+
+
+def test_hour_key_orders_like_the_tuple():
+    rng = np.random.default_rng(1)
+    parts = np.column_stack([rng.integers(1990, 2040, 2000), rng.integers(1, 13, 2000),
+                             rng.integers(1, 32, 2000), rng.integers(0, 24, 2000)])
+    keys = _hour_key(*parts.T.astype(np.int64))
+    by_tuple = sorted(range(len(parts)), key=lambda i: tuple(parts[i]))
+    assert keys[by_tuple].tolist() == sorted(keys.tolist())
+    assert len(set(keys.tolist())) == len(set(map(tuple, parts.tolist())))
+    assert (keys // _HOURS_PER_YEAR_KEY == parts[:, 0]).all()
+
+
+@pytest.mark.parametrize('start_time', [
+    datetime(2024, 7, 4, 9),
+    datetime(2024, 3, 10, 0),
+])
+def test_historical_temperatures_match_row_lookup(make_predictor, start_time):
+    raw_data = raw_weather()
+    predictor = make_predictor(raw_data)
+    assert predictor.get_historical_temperatures(start_time, num_years=5) == \
+        _reference_historical(raw_data, start_time, num_years=5)
+
+
+@pytest.mark.parametrize('start_time, num_years', [
+    (datetime(2024, 12, 31, 15), 5),  # window runs past midnight on Dec 31
+    (datetime(2024, 2, 28, 12), 5),  # Feb 29 only exists in 2020
+    (datetime(2022, 1, 1, 0), 5),  # fewer earlier years than num_years
+    (datetime(2024, 6, 1, 12), 2),
+])
+def test_historical_year_grid_matches_row_lookup(make_predictor, start_time, num_years):
+    raw_data = raw_weather()
+    predictor = make_predictor(raw_data)
+    assert predictor.get_historical_temperatures(start_time, num_years=num_years) == \
+        _reference_historical(raw_data, start_time, num_years=num_years)
+
+
+def test_historical_sidecar_is_reused(make_predictor, monkeypatch):
+    predictor = make_predictor(raw_weather())
+    start_time = datetime(2024, 5, 1, 6)
+    first = predictor.get_historical_temperatures(start_time)
+    sidecar_dir = predictor._get_filepath('raw_weather_data').parent
+    # written through a temp file that is renamed into place, so none is left behind
+    assert sorted(p.name for p in sidecar_dir.iterdir()) == ['weather_data.cached.parquet', 'weather_data.csv']
+
+    # a fresh index is rebuilt from the sidecar alone, without parsing the CSV again
+    monkeypatch.setattr(predictor._catalog, 'load', lambda name: pytest.fail(f"reloaded {name}"))
+    predictor._historical = None
+    assert predictor.get_historical_temperatures(start_time) == first
+
+
+def test_save_temperature_keeps_first_reading(make_predictor):
+    predictor = make_predictor()
+    dt = datetime(2026, 1, 20, 7, 15)
+    predictor.save_temperature(dt, 30.0)
+    predictor.save_temperature(dt.replace(minute=45), 35.0)
+    assert predictor.load_temperature(dt.replace(minute=0)) == 30.0
+    assert predictor.load_temperature(dt + timedelta(hours=1)) is None
+
+
+def test_legacy_temperatures_are_imported_once(make_predictor, tmp_path):
+    inference_dir = tmp_path / 'data' / '04_inference'
+    inference_dir.mkdir(parents=True)
+    pd.DataFrame({
+        'year': [2026, 2026], 'month': [1, 1], 'day': [20, 20], 'hour': [5, 6],
+        'temperature': [30.0, 31.0], 'timestamp': ['2026-01-20T05:00:00', '2026-01-20T06:00:00'],
+    }).to_parquet(inference_dir / 'temperatures.parquet', index=False)
+    predictor = make_predictor()
+    assert predictor.load_temperature(datetime(2026, 1, 20, 6)) == 31.0
+
+    # a later edit to the legacy file is not picked up again by a new predictor
+    predictor.save_temperature(datetime(2026, 1, 20, 7), 32.0)
+    pd.DataFrame({
+        'year': [2026], 'month': [1], 'day': [20], 'hour': [8],
+        'temperature': [40.0], 'timestamp': ['2026-01-20T08:00:00'],
+    }).to_parquet(inference_dir / 'temperatures.parquet', index=False)
+    predictor = make_predictor()
+    assert [predictor.load_temperature(datetime(2026, 1, 20, h)) for h in range(5, 9)] == [30.0, 31.0, 32.0, None]
+
+
+def test_lag_temperatures_match_per_hour_lookup(make_predictor):
+    rng = np.random.default_rng(2)
+    predictor = make_predictor()
+    start = datetime(2025, 12, 31, 20)
+    for i in rng.permutation(48):
+        if rng.random() < 0.7:
+            predictor.save_temperature(start + timedelta(hours=int(i)), round(float(rng.normal(40, 10)), 1))
+
+    # the original lag loop: one load_temperature per lag hour, nearest hour first
+    for hours in range(48):
+        dt = start + timedelta(hours=hours)
+        expected = [predictor.load_temperature(dt - timedelta(hours=i)) for i in range(1, predictor._num_lags + 1)]
+        assert predictor.get_lag_temperatures(dt) == expected
+
+
+def test_lag_lookup_searches_the_primary_key(make_predictor):
+    predictor = make_predictor()
+    conn = predictor._get_temperatures_conn()
+    plans = []
+    conn.set_trace_callback(lambda sql: plans.append(sql) if sql.lstrip().startswith('SELECT year') else None)
+    predictor.get_lag_temperatures(datetime(2026, 1, 1, 5))
+    conn.set_trace_callback(None)
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {plans[0]}").fetchall()
+    assert any(row[-1].startswith('SEARCH temps USING INDEX') for row in plan)
+    assert not any(row[-1] == 'SCAN temps' for row in plan)
+
+
+def _reference_row(params, dt: datetime, temp: float, lag_temps) -> np.ndarray:
+    # the original dict-per-call feature row, float64 in feature_columns order
+    reference_date = pd.Timestamp(params['data_engineering']['reference_date'])
+    features = {
+        'ft_month': dt.month, 'ft_day': dt.day, 'ft_hour': dt.hour,
+        'ft_days_since_2000': (pd.Timestamp(dt) - reference_date).total_seconds() / (24 * 3600),
+        'ft_temp': temp,
+    }
+    for i, lag_temp in enumerate(lag_temps, 1):
+        features[f'ft_temp_lag_{i}h'] = lag_temp
+    return np.array([[features.get(col, np.nan) for col in params['data_science']['feature_columns']]])
+
+
+@pytest.fixture
+def trained_model(project_params):
+    from xgboost import XGBRegressor
+    from weather_platform.pipelines.data_engineering.nodes import create_features
+
+    features = create_features(raw_weather(start='2022-01-01', end='2022-06-30 23:00'), project_params['data_engineering'])
+    model = XGBRegressor(n_estimators=40, max_depth=4, tree_method='hist', device='cpu')
+    model.fit(features[project_params['data_science']['feature_columns']], features['tgt_tmpf'])
+    return model
+
+
+@pytest.fixture
+def model_predictor(make_predictor, trained_model):
+    predictor = make_predictor(model=trained_model)
+    start_time = datetime(2026, 3, 8, 22)
+    for i, temp in enumerate([41.0, 43.5, 44.2, 46.8], 1):
+        predictor.save_temperature(start_time - timedelta(hours=i), temp)
+    return predictor
+
+
+@pytest.mark.parametrize('start_time', [datetime(2026, 3, 8, 22), datetime(2026, 3, 8, 22, 40)])
+def test_predict_24h_matches_per_step_predict(model_predictor, trained_model, project_params, start_time):
+    current_temp = 39.6
+    lag_temps = model_predictor.get_lag_temperatures(start_time)
+    assert None not in lag_temps
+
+    # the original loop: one model.predict per hour, feeding each prediction back in as the temp
+    expected = []
+    temp = current_temp
+    for i in range(24):
+        future_time = start_time + timedelta(hours=i)
+        predicted = float(trained_model.predict(_reference_row(project_params, future_time, temp, lag_temps))[0])
+        expected.append({"time": future_time.isoformat(), "hour": future_time.hour, "predicted_temperature": predicted})
+        lag_temps = [temp] + lag_temps[:-1]
+        temp = predicted
+
+    assert model_predictor.predict_24h(start_time, current_temp) == expected
+
+
+def test_predict_matches_model_predict(model_predictor, trained_model, project_params):
+    dt, temp, lag_temps = datetime(2026, 7, 14, 15), 82.3, [81.0, 79.4, 77.9]
+    result = model_predictor.predict(dt, temp, lag_temps)
+    assert result['prediction'] == float(trained_model.predict(_reference_row(project_params, dt, temp, lag_temps))[0])
+    # the per-thread scratch row is reset, so a second call with fewer lags sees NaN, not stale values
+    sparse = model_predictor.predict(dt, temp, [81.0, None, None])
+    assert sparse['prediction'] == float(trained_model.predict(
+        _reference_row(project_params, dt, temp, [81.0, np.nan, np.nan]))[0])
+
+
+def test_shap_contributions_match_fresh_explainer(model_predictor, trained_model, project_params):
+    import shap
+
+    dt, temp, lag_temps = datetime(2026, 1, 5, 6), 21.7, [22.4, 23.0, 24.1]
+    explainer = shap.TreeExplainer(trained_model)
+    shap_row = explainer.shap_values(_reference_row(project_params, dt, temp, lag_temps))[0]
+    abs_shap = np.abs(shap_row)
+    percentages = abs_shap / abs_shap.sum() * 100
+
+    result = model_predictor.get_shap_contributions(dt, temp, lag_temps)
+    by_feature = {c['feature']: c for c in result['contributions']}
+    names = ['Month', 'Day', 'Hour', 'Days Since 2000', 'Current Temp', 'Temp Lag 1h', 'Temp Lag 2h', 'Temp Lag 3h']
+    assert list(by_feature) == [names[i] for i in np.argsort(-percentages, kind='stable')]
+    for name, value, pct in zip(names, shap_row.tolist(), percentages.tolist()):
+        assert by_feature[name]['shap_value'] == pytest.approx(value, rel=1e-5, abs=1e-6)
+        assert by_feature[name]['percentage'] == pytest.approx(pct, rel=1e-5, abs=1e-6)
+    assert result['base_value'] == pytest.approx(float(explainer.expected_value), rel=1e-6)
+    # the explainer is kept for the same loaded model
+    model_predictor.get_shap_contributions(dt, temp, lag_temps)
+    assert model_predictor._explainer_model is model_predictor.load_model()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs os.fork")
+def test_forked_child_gets_its_own_connection_and_locks(make_predictor):
+    predictor = make_predictor()
+    predictor.save_temperature(datetime(2026, 1, 20, 7), 30.0)
+    parent_conn = predictor._temperatures_conn
+    predictor._temperatures_lock.acquire()
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # the lock held in the parent is replaced, and the child reads through its own connection
+            ok = (predictor._temperatures_conn is None and predictor._inherited_conns == [parent_conn]
+                  and not predictor._temperatures_lock.locked()
+                  and predictor.load_temperature(datetime(2026, 1, 20, 7)) == 30.0
+                  and predictor._temperatures_conn is not parent_conn)
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+    finally:
+        predictor._temperatures_lock.release()
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert predictor._temperatures_conn is parent_conn
+
+
+def test_fork_hook_does_not_keep_predictors_alive(make_predictor):
+    from weather_platform.web.predictor import _live_predictors
+
+    predictor = make_predictor()
+    assert predictor in _live_predictors
+    predictor_ref = weakref.ref(predictor)
+    del predictor
+    gc.collect()
+    assert predictor_ref() is None
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from weather_platform.web import weather_bot
+
+_TOKENIZER_PATH = Path(__file__).parents[2] / 'data' / '05_ai' / 'tinyllama'
+
+
+def _reference_periods(hours, temps):
+    # the original if/elif bucketing, as (period, high, low) for non-empty periods
+    by_period = {'morning': [], 'afternoon': [], 'evening': [], 'night': []}
+    for hour, temp in zip(hours, temps):
+        if 5 <= hour < 12:
+            by_period['morning'].append(temp)
+        elif 12 <= hour < 17:
+            by_period['afternoon'].append(temp)
+        elif 17 <= hour < 21:
+            by_period['evening'].append(temp)
+        else:
+            by_period['night'].append(temp)
+    return [(period, max(t), min(t)) for period, t in by_period.items() if t]
+
+
+def test_hour_to_period_matches_period_ranges():
+    assert len(weather_bot._HOUR_TO_PERIOD) == 24
+    for hour in range(24):
+        assert weather_bot._PERIODS[weather_bot._HOUR_TO_PERIOD[hour]] == _reference_periods([hour], [0.0])[0][0]
+
+
+@pytest.mark.parametrize('start_hour, length', [(0, 24), (7, 24), (13, 3), (22, 5), (5, 1)])
+def test_bucket_stats_match_period_loop(start_hour, length):
+    rng = np.random.default_rng(start_hour)
+    hours = (start_hour + np.arange(length)) % 24
+    temps = np.round(rng.normal(50, 15, length), 1)
+    counts, highs, lows = weather_bot._bucket_stats(hours, temps)
+    periods = [
+        (period, high, low)
+        for period, count, high, low in zip(weather_bot._PERIODS, counts, highs.tolist(), lows.tolist()) if count
+    ]
+    assert periods == _reference_periods(hours.tolist(), temps.tolist())
+    assert counts.sum() == length
+
+
+def test_prefix_and_suffix_tokens_match_full_prompt(monkeypatch):
+    transformers = pytest.importorskip('transformers')
+    if not _TOKENIZER_PATH.exists():
+        pytest.skip(f"no tokenizer at {_TOKENIZER_PATH}")
+    tokenizer = transformers.AutoTokenizer.from_pretrained(_TOKENIZER_PATH)
+    monkeypatch.setattr(weather_bot, '_tokenizer', tokenizer)
+    monkeypatch.setattr(weather_bot, '_dummy_prefix_len', len(tokenizer.encode("\n", add_special_tokens=False)) - 1)
+
+    prefix_ids = tokenizer(weather_bot._PROMPT_PREFIX).input_ids
+    for current_temp, summary in [(41.4, "morning: high 45°F, low 38°F; night: high 36°F, low 30°F"),
+                                  (-3.0, "afternoon: high 2°F, low -1°F"), (88.6, "")]:
+        suffix = weather_bot._PROMPT_SUFFIX.format(current_temp=current_temp, forecast_summary=summary)
+        full_ids = tokenizer(weather_bot._PROMPT_PREFIX + suffix).input_ids
+        assert prefix_ids + weather_bot._encode_suffix(suffix) == full_ids